@@ -3,20 +3,34 @@
 Home Assistant Add-on for Skolmaten School Menu
 """
 
-import json
+import asyncio
 import logging
 import os
+import random
+import signal
 import time
 from datetime import datetime, date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
-import requests
-from skolmaten import get_school_menu
+import aiohttp
+import diskcache
+import orjson
+from skolmaten import SkolmatenAPI
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging, level from the add-on's log_level option
+logging.basicConfig(level=getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO))
 logger = logging.getLogger(__name__)
 
+# Maximum number of simultaneous connections to Home Assistant
+HA_MAX_CONNECTIONS = 10
+
+# Failed requests to Home Assistant in a row after which sensor updates are deferred, and for how many seconds
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = 60
+
+# Directory for cached menus, /data persists across add-on restarts
+CACHE_DIR = os.environ.get('CACHE_DIR', '/data/skolmaten_cache')
+
 class HomeAssistantAPI:
     """Interface for communicating with Home Assistant"""
     
@@ -39,9 +53,89 @@ class HomeAssistantAPI:
             
         logger.info(f"Home Assistant API URL: {self.ha_url}")
         logger.info(f"Authorization header: Bearer {self.supervisor_token[:20] if self.supervisor_token else 'None'}...")
+
+        # Shared keep-alive session, opened on first use inside the event loop
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # Circuit breaker state, see create_sensor
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+        # Sensor updates deferred while the circuit is open, latest per entity, see _retry_deferred
+        self._deferred: Dict[str, tuple] = {}
+        self._retry_task: Optional[asyncio.Task] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, opening it if needed"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=HA_MAX_CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(sock_connect=2, sock_read=10),
+            )
+        return self.session
+
+    async def close(self):
+        """Stop retrying deferred sensor updates and close the shared HTTP session"""
+        if self._retry_task:
+            self._retry_task.cancel()
+            self._retry_task = None
+        if self.session:
+            await self.session.close()
+            self.session = None
     
-    def create_sensor(self, entity_id: str, state: str, attributes: Dict):
-        """Create or update a Home Assistant sensor, with exponential backoff on transient errors"""
+    def _circuit_open(self) -> bool:
+        """Check whether sensor updates are currently being skipped"""
+        return time.monotonic() < self._circuit_open_until
+
+    def _record_failure(self):
+        """Count a failed request, pausing sensor updates once the threshold is reached"""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD and not self._circuit_open():
+            self._circuit_open_until = time.monotonic() + CIRCUIT_BREAKER_COOLDOWN
+            logger.error(f"{self._consecutive_failures} requests to Home Assistant failed in a row, pausing updates for {CIRCUIT_BREAKER_COOLDOWN}s")
+
+    def _defer(self, entity_id: str, state: str, attributes: Dict):
+        """Keep a sensor update to post once the circuit closes, replacing an older one for the same sensor"""
+        logger.warning(f"Deferring update of sensor {entity_id}, Home Assistant failed {self._consecutive_failures} times in a row")
+        self._deferred[entity_id] = (state, attributes)
+        if self._retry_task is None or self._retry_task.done():
+            self._retry_task = asyncio.create_task(self._retry_deferred())
+
+    async def _retry_deferred(self):
+        """Post deferred sensor updates each time the cooldown ends, until none are left"""
+        while self._deferred:
+            await asyncio.sleep(max(self._circuit_open_until - time.monotonic(), 0))
+            deferred, self._deferred = self._deferred, {}
+            logger.info(f"Retrying {len(deferred)} deferred sensor updates")
+            for entity_id, (state, attributes) in deferred.items():
+                await self.create_sensor(entity_id, state, attributes)
+
+    async def create_sensor(self, entity_id: str, state: str, attributes: Dict):
+        """
+        Create or update a Home Assistant sensor
+
+        Every failed request counts towards the circuit breaker, retries
+        included. After CIRCUIT_BREAKER_THRESHOLD failures in a row the
+        circuit opens for CIRCUIT_BREAKER_COOLDOWN seconds: updates in
+        progress stop retrying and new ones don't wait for an unreachable
+        Home Assistant. Both are deferred and posted again when the
+        cooldown ends, so a restart of Home Assistant doesn't leave sensors
+        stale until the next update interval.
+        """
+        if self._circuit_open():
+            self._defer(entity_id, state, attributes)
+            return False
+
+        success = await self._post_sensor(entity_id, state, attributes)
+        if success:
+            # A newer state was posted, an older deferred one must not overwrite it
+            self._deferred.pop(entity_id, None)
+        elif self._circuit_open():
+            self._defer(entity_id, state, attributes)
+        return success
+
+    async def _post_sensor(self, entity_id: str, state: str, attributes: Dict) -> bool:
+        """Post a sensor state to Home Assistant, with exponential backoff on transient errors"""
         data = {
             "state": state,
             "attributes": attributes
@@ -50,63 +144,78 @@ class HomeAssistantAPI:
         api_url = f"{self.ha_url}/api/states/{entity_id}"
         logger.info(f"Attempting to update sensor {entity_id} at URL: {api_url}")
         logger.info(f"Request data keys: {list(data.keys())}")
+        body = orjson.dumps(data)
 
-        max_attempts = 8
+        # Every failed attempt counts towards the circuit breaker, which opens
+        # at the latest on the last attempt
+        max_attempts = CIRCUIT_BREAKER_THRESHOLD
         delay = 5  # seconds, doubles each attempt
 
         for attempt in range(1, max_attempts + 1):
+            # Another update may have opened the circuit while this one waited
+            if attempt > 1 and self._circuit_open():
+                logger.warning(f"Giving up on sensor {entity_id}, sensor updates are paused")
+                return False
+
             try:
-                response = requests.post(
-                    api_url,
-                    headers=self.headers,
-                    json=data,
-                    timeout=10
-                )
+                async with self._get_session().post(api_url, data=body) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After", "")
+                    logger.info(f"Response status code: {status}")
 
-                logger.info(f"Response status code: {response.status_code}")
+                    if status in (200, 201):
+                        logger.info(f"Successfully updated sensor {entity_id}")
+                        self._consecutive_failures = 0
+                        return True
 
-                if response.status_code in (200, 201):
-                    logger.info(f"Successfully updated sensor {entity_id}")
-                    return True
+                    # Log detailed error information
+                    try:
+                        response_text = await response.text()
+                        logger.error(f"Failed to update sensor {entity_id}: {status}")
+                        logger.error(f"Response body: {response_text}")
+                        logger.error(f"Response headers: {dict(response.headers)}")
+                    except Exception:
+                        logger.error("Could not retrieve response details")
 
-                # Log detailed error information
-                try:
-                    response_text = response.text
-                    logger.error(f"Failed to update sensor {entity_id}: {response.status_code}")
-                    logger.error(f"Response body: {response_text}")
-                    logger.error(f"Response headers: {dict(response.headers)}")
-                except Exception:
-                    logger.error("Could not retrieve response details")
-
-                if response.status_code in (502, 503, 504):
-                    # Transient error — HA may not be ready yet
-                    if attempt < max_attempts:
-                        logger.warning(f"Transient error ({response.status_code}), retrying in {delay}s (attempt {attempt}/{max_attempts})")
-                        time.sleep(delay)
-                        delay = min(delay * 2, 120)
+                self._record_failure()
+                if status in (502, 503, 504):
+                    # Transient error — HA may not be ready yet, honour Retry-After if given
+                    if self._circuit_open():
+                        logger.warning(f"Giving up on sensor {entity_id}, sensor updates are paused")
+                    elif attempt < max_attempts:
+                        wait = float(retry_after) if retry_after.isdigit() else delay + random.uniform(0, 0.5)
+                        logger.warning(f"Transient error ({status}), retrying in {wait:.1f}s (attempt {attempt}/{max_attempts})")
+                        await asyncio.sleep(wait)
+                        delay *= 2
                         continue
-                elif response.status_code == 401:
+                elif status == 401:
                     logger.error("Authentication failed. Checking token and API endpoint...")
                     logger.error(f"Current token length: {len(self.supervisor_token) if self.supervisor_token else 0}")
                     logger.error(f"Current API URL: {api_url}")
-                elif response.status_code == 404:
+                elif status == 404:
                     logger.error("API endpoint not found. May need different URL.")
-                elif response.status_code == 403:
+                elif status == 403:
                     logger.error("Forbidden. Add-on may need additional permissions.")
 
                 return False
 
-            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
                 logger.error(f"Connection/timeout error updating sensor {entity_id}: {e}")
+                self._record_failure()
+                if self._circuit_open():
+                    logger.warning(f"Giving up on sensor {entity_id}, sensor updates are paused")
+                    return False
                 if attempt < max_attempts:
-                    logger.warning(f"Retrying in {delay}s (attempt {attempt}/{max_attempts})")
-                    time.sleep(delay)
-                    delay = min(delay * 2, 120)
+                    wait = delay + random.uniform(0, 0.5)
+                    logger.warning(f"Retrying in {wait:.1f}s (attempt {attempt}/{max_attempts})")
+                    await asyncio.sleep(wait)
+                    delay *= 2
                     continue
                 logger.error("This may indicate the Home Assistant API endpoint is unreachable")
                 return False
             except Exception as e:
                 logger.error(f"Unexpected error updating sensor {entity_id}: {e}")
+                self._record_failure()
                 return False
 
         return False
@@ -119,6 +228,7 @@ class SkolmatenAddon:
         self.schools = self._load_config()
         self.update_interval = int(os.environ.get('UPDATE_INTERVAL', 3600))
         self.n_weeks = int(os.environ.get('N_WEEKS', 1))
+        self.cache = diskcache.Cache(CACHE_DIR)
     
     def _load_config(self) -> List[Dict]:
         """Load school configuration"""
@@ -128,7 +238,7 @@ class SkolmatenAddon:
                 logger.error("No schools configured in SCHOOLS environment variable")
                 return []
             
-            schools = json.loads(schools_json)
+            schools = orjson.loads(schools_json)
             logger.info(f"Loaded {len(schools)} schools from configuration")
             
             # Validate school configuration
@@ -140,32 +250,26 @@ class SkolmatenAddon:
                     logger.warning(f"Invalid school configuration: {school}")
             
             return valid_schools
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Error parsing SCHOOLS JSON: {e}")
             return []
         except Exception as e:
             logger.error(f"Error loading configuration: {e}")
             return []
     
-    def _get_current_menu(self, menu_data: List[Dict]) -> Optional[Dict]:
-        """Get today's menu from the menu data"""
-        today = date.today().isoformat()
-        
-        for menu_item in menu_data:
-            if menu_item.get('date') == today:
-                return menu_item
-        
-        return None
+    def _index_by_date(self, menu_data: List[Dict]) -> Dict[str, Dict]:
+        """Index menu data by date, skipping entries without a date"""
+        return {menu_item['date']: menu_item for menu_item in menu_data if menu_item.get('date')}
+    
+    def _get_current_menu(self, by_date: Dict[str, Dict]) -> Optional[Dict]:
+        """Get today's menu from the menu data indexed by date"""
+        return by_date.get(date.today().isoformat())
     
-    def _create_calendar_structure(self, menu_data: List[Dict]) -> Dict[str, List[Dict]]:
-        """Convert menu data to calendar structure organized by date"""
+    def _create_calendar_structure(self, by_date: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """Convert menu data indexed by date to calendar structure organized by date"""
         calendar = {}
 
-        for menu_item in menu_data:
-            menu_date = menu_item.get('date')
-            if not menu_date:
-                continue
-
+        for menu_date, menu_item in by_date.items():
             courses = menu_item.get('courses', [])
             dishes = []
 
@@ -182,10 +286,10 @@ class SkolmatenAddon:
 
         return calendar
     
-    def _create_sensor_attributes(self, menu_data: List[Dict], school_slug: str, school_name: str) -> Dict:
-        """Create sensor attributes from menu data"""
+    def _create_sensor_attributes(self, by_date: Dict[str, Dict], school_slug: str, school_name: str) -> Dict:
+        """Create sensor attributes from menu data indexed by date"""
         # Create calendar structure organized by date
-        calendar = self._create_calendar_structure(menu_data)
+        calendar = self._create_calendar_structure(by_date)
 
         attributes = {
             "provider": "skolmaten.se",
@@ -199,8 +303,8 @@ class SkolmatenAddon:
 
         return attributes
     
-    def update_school_sensor(self, school: Dict):
-        """Update sensor for a single school"""
+    async def update_school_sensor(self, school: Dict, menu_data: Union[List[Dict], Exception]):
+        """Update sensor for a single school from its fetched menu, or the error fetching it"""
         school_name = school.get('name', 'Unknown School')
         school_slug = school.get('slug')
         
@@ -211,24 +315,18 @@ class SkolmatenAddon:
         logger.info(f"Updating menu for {school_name} ({school_slug})")
         
         try:
-            # Fetch menu data with error handling
-            try:
-                menu_data = get_school_menu(
-                    school_slug, 
-                    n_weeks=self.n_weeks
-                )
-            except Exception as selenium_error:
-                logger.error(f"Selenium error for {school_name}: {selenium_error}")
+            if isinstance(menu_data, Exception):
+                logger.error(f"Error fetching menu for {school_name}: {menu_data}")
                 # Create a sensor with error state
                 entity_id = f"sensor.skolmaten_{school_slug.replace('-', '_')}"
                 error_attributes = {
                     "icon": "mdi:alert-circle",
                     "friendly_name": f"Menu - {school_name}",
                     "last_updated": datetime.now().isoformat(),
-                    "error": str(selenium_error),
+                    "error": str(menu_data),
                     "calendar": {}
                 }
-                return self.ha_api.create_sensor(entity_id, "Error fetching menu", error_attributes)
+                return await self.ha_api.create_sensor(entity_id, "Error fetching menu", error_attributes)
             
             if not menu_data:
                 logger.warning(f"No menu data found for {school_name}")
@@ -240,10 +338,13 @@ class SkolmatenAddon:
                     "last_updated": datetime.now().isoformat(),
                     "calendar": {}
                 }
-                return self.ha_api.create_sensor(entity_id, "No menu data available", no_data_attributes)
+                return await self.ha_api.create_sensor(entity_id, "No menu data available", no_data_attributes)
+            
+            # Index once, shared by today's menu lookup and the calendar
+            by_date = self._index_by_date(menu_data)
             
             # Get today's menu
-            current_menu = self._get_current_menu(menu_data)
+            current_menu = self._get_current_menu(by_date)
 
             # Prepare sensor state
             if current_menu:
@@ -255,10 +356,10 @@ class SkolmatenAddon:
             entity_id = f"sensor.skolmaten_{school_slug.replace('-', '_')}"
 
             # Create attributes
-            attributes = self._create_sensor_attributes(menu_data, school_slug, school_name)
+            attributes = self._create_sensor_attributes(by_date, school_slug, school_name)
             
             # Update Home Assistant sensor
-            success = self.ha_api.create_sensor(entity_id, state, attributes)
+            success = await self.ha_api.create_sensor(entity_id, state, attributes)
             
             if success:
                 logger.info(f"Successfully updated sensor for {school_name}")
@@ -271,33 +372,62 @@ class SkolmatenAddon:
             logger.error(f"Unexpected error updating {school_name}: {e}")
             return False
     
-    def update_all_schools(self):
-        """Update sensors for all configured schools"""
+    async def update_all_schools(self):
+        """Update sensors for all configured schools concurrently"""
         logger.info("Starting update cycle for all schools")
         
         if not self.schools:
             logger.warning("No schools configured")
             return
         
-        for school in self.schools:
-            try:
-                self.update_school_sensor(school)
-                # Small delay between schools to be respectful to the website
-                time.sleep(2)
-            except Exception as e:
-                logger.error(f"Error processing school {school}: {e}")
+        # Drop expired menus, including those of previous weeks
+        self.cache.expire()
+        
+        # Fetch all menus first, sharing the session's connection pool to the website
+        slugs = [school['slug'] for school in self.schools if school['slug']]
+        async with SkolmatenAPI(cache=self.cache) as api:
+            menus = await api.get_many(slugs, n_weeks=self.n_weeks, return_exceptions=True)
+        
+        await asyncio.gather(
+            *(self.update_school_sensor(school, menus.get(school['slug'], [])) for school in self.schools)
+        )
         
         logger.info("Completed update cycle")
+
+    async def _main(self):
+        """Update all schools every update interval until cancelled, then release the HTTP sessions"""
+        # Stop cleanly when the add-on is stopped
+        loop = asyncio.get_running_loop()
+        main_task = asyncio.current_task()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, main_task.cancel)
+
+        try:
+            while True:
+                try:
+                    await self.update_all_schools()
+                except Exception as e:
+                    logger.error(f"Update cycle failed: {e}")
+                
+                logger.info(f"Waiting {self.update_interval} seconds until next update...")
+                await asyncio.sleep(self.update_interval)
+        except asyncio.CancelledError:
+            logger.info("Shutdown requested, stopping updates")
+        finally:
+            await self.ha_api.close()
     
     def run(self):
-        """Run once and exit"""
-        logger.info("Running main python script (single execution)")
+        """Run periodic updates until stopped"""
+        logger.info("Running main python script")
         logger.info(f"Configured schools: {len(self.schools)}")
         logger.info(f"Number of weeks to fetch: {self.n_weeks}")
+        logger.info(f"Update interval: {self.update_interval} seconds")
         
-        # Run update for all schools once
-        self.update_all_schools()
-        logger.info("Single execution completed")
+        try:
+            asyncio.run(self._main())
+        finally:
+            self.cache.close()
+        logger.info("Stopped")
 
 def main():
     """Main entry point"""
@@ -2,221 +2,529 @@
 Skolmaten API - Python Wrapper
 A Python library for accessing school lunch menus from Skolmaten.se.
 """
-import time
-import re
+import asyncio
+import contextlib
+import random
 import logging
-from typing import List
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import os
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+import aiohttp
+from lxml import etree
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://skolmaten.se"
+
+# User agent to avoid detection
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+
+# Maximum number of simultaneous connections to the website
+MAX_CONNECTIONS_PER_HOST = 5
+
+# Delay in seconds after each request before its slot is reused, to be respectful to the website
+POLITENESS_DELAY = 2
+
+# Retry policy for transient failures when fetching pages: up to
+# RETRY_TOTAL retries with exponential backoff (1s, 2s, 4s) plus jitter
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1.0
+RETRY_BACKOFF_JITTER = 0.5
+RETRY_STATUSES = (502, 503, 504)
+
+# Day names that start a day in the menu, Swedish and English
+DAY_WORDS = frozenset([
+    "måndag", "tisdag", "onsdag", "torsdag", "fredag",
+    "monday", "tuesday", "wednesday", "thursday", "friday",
+])
+
+# Link texts for the next week navigation, Swedish and English
+NEXT_WEEK_TEXTS = ("nästa vecka", "next week")
+
+# Seconds a fetched menu is reused before it is fetched again
+MENU_CACHE_TTL = 6 * 3600
+
+# Seconds the validators and parsed menu of a page are kept for conditional requests
+PAGE_CACHE_TTL = 7 * 24 * 3600
+
+# Bytes read from the response at a time while parsing
+CHUNK_SIZE = 4096
+
+# Elements that start a new line of menu text, as in the browser's innerText.
+# Text in other (inline) elements, e.g. <em>, stays on the line around it.
+BLOCK_TAGS = frozenset([
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "td", "th", "tr", "ul",
+])
+
+MENU_CONTAINER_XPATH = etree.XPath('//*[@id="menu-container"]')
+
+# Week title above the menu, the element with classes text-2xl and font-semibold
+WEEK_TITLE_XPATH = etree.XPath(
+    '//*[contains(concat(" ", normalize-space(@class), " "), " text-2xl ")'
+    ' and contains(concat(" ", normalize-space(@class), " "), " font-semibold ")]'
+)
+
+
+class MenuParseError(RuntimeError):
+    """Raised when a fetched page can't be parsed into a menu"""
+
+
+# Errors a school's fetch is expected to fail with, as opposed to bugs
+FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, MenuParseError)
+
+
+def _retry_after(response: aiohttp.ClientResponse, default: float) -> float:
+    """Seconds to wait according to the Retry-After header, or default if absent"""
+    retry_after = response.headers.get("Retry-After", "")
+    return float(retry_after) if retry_after.isdigit() else default
+
+
+def _element_text(element: etree._Element) -> str:
+    """Text content of an element and its descendants"""
+    return "".join(element.itertext())
+
+
+def _block_text(element: etree._Element) -> str:
+    """
+    Text content of an element with one line per block, like innerText
+
+    Lines break only at block elements and <br>, so inline markup such as
+    <em> doesn't split a course into several lines. Whitespace within a
+    line is collapsed to single spaces.
+
+    Args:
+        element: Element to get the text of
+
+    Returns:
+        Text content with lines separated by newlines
+    """
+    parts = []
+    for event, node in etree.iterwalk(element, events=("start", "end")):
+        # Comments and processing instructions have no string tag, only their tail is text
+        is_tag = isinstance(node.tag, str)
+        if event == "start":
+            if is_tag and (node.tag in BLOCK_TAGS or node.tag == "br"):
+                parts.append("\n")
+            if is_tag and node.text and node.tag not in ("script", "style"):
+                parts.append(node.text.replace("\n", " "))
+        else:
+            if is_tag and node.tag in BLOCK_TAGS:
+                parts.append("\n")
+            if node.tail and node is not element:
+                parts.append(node.tail.replace("\n", " "))
+    return "\n".join(" ".join(line.split()) for line in "".join(parts).split("\n"))
+
+
+def _is_next_week_link(element: etree._Element) -> bool:
+    """Check whether an element is a link to the next week, by its text, aria-label or title"""
+    if element.tag != "a":
+        return False
+    # Arrow-only links carry their label in attributes instead of text
+    link_text = " ".join([
+        _element_text(element), element.get("aria-label", ""), element.get("title", ""),
+    ]).lower()
+    return any(text in link_text for text in NEXT_WEEK_TEXTS)
+
+
+def _is_week_title(element: etree._Element) -> bool:
+    """Check whether an element is the week title, the same element WEEK_TITLE_XPATH finds"""
+    classes = element.get("class", "").split()
+    return "text-2xl" in classes and "font-semibold" in classes
+
+
+def _is_date(line: str) -> bool:
+    """Check whether a menu line is a date, e.g. 2025-08-18"""
+    # Character tests instead of a regex, most lines fail on the length check
+    return (
+        len(line) == 10 and line[4] == "-" and line[7] == "-"
+        and line[:4].isdigit() and line[5:7].isdigit() and line[8:].isdigit()
+    )
+
+
+def _is_day_line(line_lower: str) -> bool:
+    """Check whether a lowercased menu line starts with a day name"""
+    first_word = line_lower.split(maxsplit=1)[0]
+    return first_word.rstrip(",.:") in DAY_WORDS
+
 
 class SkolmatenAPI:
     """Main class for interacting with Skolmaten.se API"""
 
-    def __init__(self):
+    def __init__(self, cache=None, connect_timeout: float = 3.0, read_timeout: float = 10.0):
         """
         Initialize the Skolmaten API client
-        
-        Always runs in headless mode for container environments.
+
+        Pages are fetched over a pooled HTTP session and parsed directly,
+        no browser is involved. The session is opened on context manager
+        entry and is meant to be reused for all schools, including
+        concurrent get_menu calls. Cookies are not kept, so one school's
+        requests never carry state from another.
+
+        Args:
+            cache: Optional diskcache.Cache. When given, menus are reused for
+                MENU_CACHE_TTL seconds within the same ISO week, and the ETag and
+                Last-Modified of each page are stored with its parsed menu so
+                unchanged pages (304 Not Modified) are not parsed again.
+            connect_timeout: Seconds to wait for a connection to the website
+            read_timeout: Seconds to wait for each read from the website.
+                Timeouts are retried like other transient failures.
         """
-        self.driver = None
+        self.session = None
+        self.cache = cache
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        # Fetches in progress by menu cache key, shared by concurrent callers
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        # One slot per connection to the website, see _request_slot
+        self._request_slots = asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)
 
-    def _setup_driver(self) -> webdriver.Chrome:
-        """Setup Chrome WebDriver with appropriate options"""
-        chrome_options = Options()
-        
-        # Always use headless in Docker containers
-        chrome_options.add_argument("--headless=new")
-        
-        # Docker container specific flags
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument("--disable-background-timer-throttling")
-        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-        chrome_options.add_argument("--disable-renderer-backgrounding")
-        chrome_options.add_argument("--disable-field-trial-config")
-        chrome_options.add_argument("--disable-background-networking")
-        chrome_options.add_argument("--disable-component-update")
-        chrome_options.add_argument("--disable-client-side-phishing-detection")
-        chrome_options.add_argument("--disable-sync")
-        chrome_options.add_argument("--disable-translate")
-        chrome_options.add_argument("--disable-ipc-flooding-protection")
-        chrome_options.add_argument("--no-first-run")
-        chrome_options.add_argument("--no-default-browser-check")
-        chrome_options.add_argument("--no-pings")
-        chrome_options.add_argument("--no-zygote")
-        chrome_options.add_argument("--single-process")
-        chrome_options.add_argument("--log-level=3")
-        chrome_options.add_argument("--silent")
-        
-        # Set window size for headless mode
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        # User agent to avoid detection
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36")
+    async def __aenter__(self):
+        """Context manager entry: open HTTP session"""
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=MAX_CONNECTIONS_PER_HOST),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            headers={"User-Agent": USER_AGENT},
+            timeout=self.timeout,
+        )
+        return self
 
-        # Check if we're running in Docker/Alpine Linux
-        chrome_binary = os.environ.get('CHROME_BIN')
-        chromedriver_path = os.environ.get('CHROME_DRIVER')
-        
-        if chrome_binary and os.path.exists(chrome_binary):
-            chrome_options.binary_location = chrome_binary
-        
-        if chromedriver_path and os.path.exists(chromedriver_path):
-            service = Service(chromedriver_path, log_path=os.devnull)
-        else:
-            # Fallback to webdriver-manager
-            service = Service(
-                ChromeDriverManager().install(),
-                log_path=os.devnull,
-            )
-        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit: close HTTP session"""
+        await self.close()
+
+    async def close(self):
+        """Cancel fetches still in progress and close the HTTP session"""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    @contextlib.asynccontextmanager
+    async def _request_slot(self):
+        """
+        Hold one of the request slots for a request to the website
+
+        The slot is kept for POLITENESS_DELAY seconds after each answered
+        request, so no more than MAX_CONNECTIONS_PER_HOST requests start per
+        delay. Requests that raise are already spaced by the retry backoff.
+        """
+        async with self._request_slots:
+            yield
+            await asyncio.sleep(POLITENESS_DELAY)
+
+    async def _read_page(self, response: aiohttp.ClientResponse, find_next_week: bool) -> etree._Element:
+        """
+        Stream-parse a page, stopping once the parts needed are read
+
+        Reading ends after the menu container and the week title have been
+        closed and, if find_next_week is set, the next week link has been
+        seen. The rest of the page (footer, scripts) is never downloaded or
+        parsed. A page without week title is read to the end.
+
+        Args:
+            response: Response of the page
+            find_next_week: Whether the next week link is needed
+
+        Returns:
+            Root element of the parsed (possibly partial) page
+
+        Raises:
+            MenuParseError: If the page charset is unknown or its HTML can't be parsed
+        """
+        # Without a charset in the response, lxml would decode the page as Latin-1
+        charset = response.charset or "utf-8"
         try:
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info(f"Chrome driver started successfully")
-            
-            # Get Chrome version info
-            capabilities = driver.capabilities
-            chrome_version = capabilities.get('browserVersion', 'Unknown')
-            driver_version = capabilities.get('chrome', {}).get('chromedriverVersion', 'Unknown')
-            logger.info(f"Chrome version: {chrome_version}")
-            logger.info(f"ChromeDriver version: {driver_version}")
-            
-            return driver
-        except Exception as e:
-            logger.error(f"Failed to start Chrome driver: {e}")
-            raise
+            parser = etree.HTMLPullParser(events=("end",), encoding=charset)
+        except LookupError as e:
+            raise MenuParseError(f"Unknown page charset '{charset}'") from e
+        found_container = False
+        found_title = False
+        found_next_week = not find_next_week
+        bytes_read = 0
 
-    def __enter__(self):
-        """Context manager entry: setup driver"""
-        self.driver = self._setup_driver()
-        return self
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            parser.feed(chunk)
+            bytes_read += len(chunk)
+            for _, element in parser.read_events():
+                if element.get("id") == "menu-container":
+                    found_container = True
+                elif not found_title and _is_week_title(element):
+                    found_title = True
+                elif not found_next_week and _is_next_week_link(element):
+                    found_next_week = True
+            if found_container and found_title and found_next_week:
+                logger.info(f"Stopped reading page after {bytes_read} bytes")
+                break
+
+        try:
+            return parser.close()
+        except etree.LxmlError as e:
+            raise MenuParseError(f"Could not parse page HTML: {e}") from e
+
+    async def _fetch_page(
+        self, url: str, find_next_week: bool = False, headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[etree._Element, Optional[str], Optional[str]]]:
+        """
+        Fetch a page and parse its HTML, retrying transient failures
+
+        Args:
+            url: URL of the page
+            find_next_week: Whether the next week link is needed
+            headers: Extra request headers, e.g. conditional request validators
+
+        Returns:
+            Tuple of root element of the parsed page, ETag and Last-Modified,
+            or None if the server answered 304 Not Modified
+        """
+        max_attempts = RETRY_TOTAL + 1
+
+        for attempt in range(1, max_attempts + 1):
+            delay = RETRY_BACKOFF_FACTOR * 2 ** (attempt - 1) + random.uniform(0, RETRY_BACKOFF_JITTER)
+            started = time.monotonic()
+            try:
+                async with self._request_slot(), self.session.get(url, headers=headers) as response:
+                    logger.info(f"Page loaded - Status: {response.status}, URL: '{response.url}'")
+                    if response.status == 304:
+                        return None
+                    if response.status not in RETRY_STATUSES or attempt == max_attempts:
+                        response.raise_for_status()
+                        root = await self._read_page(response, find_next_week)
+                        logger.debug(f"Fetched and parsed {url} in {time.monotonic() - started:.3f}s")
+                        return root, response.headers.get("ETag"), response.headers.get("Last-Modified")
+                    logger.warning(f"Transient error ({response.status}) fetching {url}")
+                    delay = _retry_after(response, delay)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == max_attempts:
+                    raise
+                logger.warning(f"Connection/timeout error fetching {url} after {time.monotonic() - started:.1f}s: {e}")
+
+            logger.warning(f"Retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})")
+            await asyncio.sleep(delay)
+
+    def _find_next_week_url(self, root: etree._Element, current_url: str) -> Optional[str]:
+        """
+        Find the URL behind the next week link
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit: close driver"""
-        self.close()
+        Args:
+            root: Root element of the current week page
+            current_url: URL of the current week, used to resolve relative links
 
-    def close(self):
-        """Close the WebDriver"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        Returns:
+            Absolute URL of the next week, or None if no link was found
+        """
+        for link in root.iter("a"):
+            if _is_next_week_link(link):
+                href = link.get("href")
+                if href:
+                    logger.info(f"Found next week link with text: '{_element_text(link).strip()}'")
+                    return urljoin(current_url, href)
+        return None
 
-    def _parse_menu_data(self, school_name: str) -> List[dict]:
+    def _parse_menu_data(self, page_text: str, week_title: str, school_name: str) -> List[dict]:
         """
-        Parse menu data from the current page
+        Parse menu data from the menu container text
 
         Args:
+            page_text: Text content of the menu container
+            week_title: Week title shown above the menu
             school_name: Name of the school
 
         Returns:
             List of menu entries, each as a dict with keys: items, date, week, day
         """
         menu_list = []
-        try:
-            logger.info(f"Starting menu parsing for {school_name}")
-            
-            # Ensure menu container is present
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.ID, "menu-container"))
-            )
-            time.sleep(2)  # Allow time for the page to fully render
-            # Get page text
-            page_text = self.driver.find_element(By.ID, "menu-container").text
-            logger.info(f"Menu container text length: {len(page_text)} characters")
-            
-            if len(page_text) < 50:  # Suspiciously short
-                logger.warning(f"Menu container text is very short: '{page_text}'")
-            
-            # Get week title
-            try:
-                week_title = self.driver.find_element(
-                    By.CSS_SELECTOR, ".text-2xl.font-semibold"
-                ).text
-                logger.info(f"Week title found: '{week_title}'")
-            except Exception as e:
-                logger.warning(f"Could not find week title element: {e}")
-                week_title = "Unknown Week"
-
-            # Support both Swedish and English day names
-            swedish_days = ["måndag", "tisdag", "onsdag", "torsdag", "fredag"]
-            english_days = ["monday", "tuesday", "wednesday", "thursday", "friday"]
-            all_days = swedish_days + english_days
-            
-            lines = [line.strip() for line in page_text.split("\n") if line.strip()]
-            logger.info(f"Split page text into {len(lines)} lines")
+        # Per-line logging is only formatted when debug logging is enabled
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        logger.info(f"Starting menu parsing for {school_name}")
+        logger.info(f"Menu container text length: {len(page_text)} characters")
+        
+        logger.info(f"Week title found: '{week_title}'")
+        
+        # Week number is the last word of the title, e.g. "Vecka 34"
+        week_word = week_title.rsplit(None, 1)[-1] if week_title else ""
+        week_number = int(week_word) if week_word.isdigit() else None
+
+        current_date = None
+        current_day = None
+        days = []
+        line_count = 0
+        
+        # Single pass over the lines: a day line starts a new day, the
+        # following lines are its date and courses until the next day
+        for raw_line in page_text.splitlines():
+            line = raw_line.strip()
+            if not line:
+                continue
+            line_count += 1
             
             # Log first few lines for debugging
-            if lines:
-                logger.info(f"First 5 lines: {lines[:5]}")
+            if debug and line_count <= 5:
+                logger.debug(f"Line {line_count}: '{line}'")
             
-            current_day = None
-            current_date = None
-            
-            for i, line in enumerate(lines):
-                line_lower = line.lower()
-                for day in all_days:
-                    if day in line_lower:
-                        current_day = line
-                        logger.info(f"Found day: '{current_day}' at line {i}")
-                        
-                        menu_items = []
-                        j = i + 1
-                        while j < len(lines):
-                            next_line = lines[j].strip()
-                            if any(d in next_line.lower() for d in all_days):
-                                break
-                            if next_line and len(next_line) > 5:
-                                if not re.match(r"^\d{4}-\d{2}-\d{2}$", next_line):
-                                    if "Med reservation" not in next_line:
-                                        menu_items.append(next_line)
-                                        logger.info(f"  Added menu item: '{next_line}'")
-                                else:
-                                    current_date = next_line
-                                    logger.info(f"  Found date: '{current_date}'")
-                            j += 1
-                        
-                        if menu_items:
-                            menu_entry = {
-                                "weekday": current_day,
-                                "date": current_date,
-                                "week": int(week_title.split()[-1]) if week_title != "Unknown Week" and week_title.split()[-1].isdigit() else None,
-                                "courses": menu_items,
-                            }
-                            menu_list.append(menu_entry)
-                            logger.info(f"  Created menu entry for {current_day}: {len(menu_items)} courses")
-                        else:
-                            logger.warning(f"  No menu items found for {current_day}")
-                        break
-            
-            logger.info(f"Menu parsing completed. Found {len(menu_list)} days with menus")
-            
-        except Exception as e:
-            logger.error(f"Error parsing menu data for {school_name}: {e}")
-            # Log some page source for debugging
-            try:
-                page_source_snippet = self.driver.page_source[:1000]
-                logger.error(f"Page source snippet: {page_source_snippet}")
-            except:
-                logger.error("Could not retrieve page source snippet")
-                
+            if _is_day_line(line.lower()):
+                current_day = {"weekday": line, "date": current_date, "courses": []}
+                days.append(current_day)
+                if debug:
+                    logger.debug(f"Found day: '{line}' at line {line_count}")
+            elif current_day is None:
+                # Lines before the first day
+                continue
+            elif _is_date(line):
+                current_date = current_day["date"] = line
+                if debug:
+                    logger.debug(f"  Found date: '{line}'")
+            elif len(line) > 5 and "Med reservation" not in line:
+                current_day["courses"].append(line)
+                if debug:
+                    logger.debug(f"  Added menu item: '{line}'")
+        
+        logger.info(f"Read {line_count} lines of menu text")
+        
+        if not days:
+            # Container is present but holds no days, e.g. rendered client-side
+            logger.warning(f"No day names found in menu container: '{page_text[:200]}'")
+        
+        for day in days:
+            if day["courses"]:
+                menu_entry = {
+                    "weekday": day["weekday"],
+                    "date": day["date"],
+                    "week": week_number,
+                    "courses": day["courses"],
+                }
+                menu_list.append(menu_entry)
+                logger.info(f"Found {day['weekday']}: {len(day['courses'])} courses")
+            else:
+                logger.warning(f"  No menu items found for {day['weekday']}")
+        
+        logger.info(f"Menu parsing completed. Found {len(menu_list)} days with menus")
+
         return menu_list
 
-    def get_menu(
+    def _parse_page(self, root: etree._Element, school_name: str) -> List[dict]:
+        """
+        Extract the menu container and week title from a page and parse them
+
+        Args:
+            root: Root element of a week page
+            school_name: Name of the school
+
+        Returns:
+            List of menu entries, each as a dict
+
+        Raises:
+            MenuParseError: If the page has no menu container
+        """
+        containers = MENU_CONTAINER_XPATH(root)
+        if not containers:
+            raise MenuParseError("Menu container not found on page")
+
+        titles = WEEK_TITLE_XPATH(root)
+        if titles:
+            week_title = _element_text(titles[0]).strip()
+        else:
+            logger.warning("Could not find week title element")
+            week_title = "Unknown Week"
+
+        page_text = _block_text(containers[0])
+        return self._parse_menu_data(page_text, week_title, school_name)
+
+    async def _get_week(
+        self, url: str, school_name: str, find_next_week: bool
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Fetch and parse one week page, reusing the cached menu if the page is unchanged
+
+        Args:
+            url: URL of the week page
+            school_name: Name of the school
+            find_next_week: Whether the next week URL is needed
+
+        Returns:
+            Tuple of the week's menu entries and the next week URL (None if not
+            needed or not found)
+        """
+        cache_key = ("page", url)
+        cached = self.cache.get(cache_key) if self.cache is not None else None
+        headers = {}
+
+        # A cached entry without next week URL can't answer a request that needs one
+        if cached and (cached[3] or not find_next_week):
+            etag, last_modified, _, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        page = await self._fetch_page(url, find_next_week, headers)
+        if page is None:
+            logger.info(f"Page not modified, reusing parsed menu: {url}")
+            _, _, week_menu, next_url = cached
+            return week_menu, next_url
+
+        root, etag, last_modified = page
+        week_menu = self._parse_page(root, school_name)
+
+        next_url = None
+        if find_next_week:
+            next_url = self._find_next_week_url(root, url)
+            if not next_url:
+                logger.warning("Could not find next week link in any language (Swedish/English)")
+                # Log available links for debugging
+                link_texts = [_element_text(link).strip() for link in root.iter("a") if _element_text(link).strip()]
+                logger.info(f"Available links with text: {link_texts}")
+
+        if self.cache is not None and (etag or last_modified) and week_menu:
+            self.cache.set(cache_key, (etag, last_modified, week_menu, next_url), expire=PAGE_CACHE_TTL)
+
+        return week_menu, next_url
+
+    async def get_menu(
         self, school_name: str, n_weeks: int = 1
+    ) -> List[dict]:
+        """
+        Get lunch menu for a school, from the cache if possible
+
+        Concurrent calls for the same school and number of weeks share one fetch.
+
+        Args:
+            school_name: Name of the school (e.g., 'svenstorps-forskola')
+            n_weeks: Number of weeks to fetch (1 = current week, 2 = current + next, etc.)
+
+        Returns:
+            List of menu entries, each as a dict
+        """
+        iso_year, iso_week, _ = date.today().isocalendar()
+        cache_key = (school_name, iso_year, iso_week, n_weeks)
+
+        if self.cache is not None:
+            menu_list = self.cache.get(cache_key)
+            if menu_list is not None:
+                logger.info(f"Using cached menu for {school_name} (week {iso_week})")
+                return menu_list
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_menu(school_name, n_weeks))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            logger.info(f"Waiting for fetch in progress for {school_name}")
+
+        menu_list = await asyncio.shield(task)
+        if self.cache is not None and menu_list:
+            self.cache.set(cache_key, menu_list, expire=MENU_CACHE_TTL)
+        return menu_list
+
+    async def _fetch_menu(
+        self, school_name: str, n_weeks: int
     ) -> List[dict]:
         """
         Fetch lunch menu for a school
@@ -228,105 +536,79 @@ class SkolmatenAPI:
         Returns:
             List of menu entries, each as a dict
         """
-        url = f"https://skolmaten.se/{school_name}"
-        logger.info(f"Navigating to: {url}")
+        url = f"{BASE_URL}/{school_name}"
+        logger.info(f"Fetching: {url}")
         
         try:
-            self.driver.get(url)
-            logger.info(f"Navigation completed, waiting for page load...")
-            
-            # Check page title and URL
-            page_title = self.driver.title
-            current_url = self.driver.current_url
-            logger.info(f"Page loaded - Title: '{page_title}', URL: '{current_url}'")
-            
-            # Wait for menu container
-            logger.info("Waiting for menu-container element...")
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "menu-container"))
-            )
-            logger.info("Menu container found!")
-            
-            # Check if we got a valid school page
-            if "404" in page_title.lower() or "not found" in page_title.lower():
-                logger.warning(f"Possible 404 page detected. Title: '{page_title}'")
-            
             # Start with current week menu
-            menu_list = self._parse_menu_data(school_name)
+            menu_list, next_url = await self._get_week(url, school_name, find_next_week=n_weeks > 1)
             logger.info(f"Week 1 menu parsed: {len(menu_list)} entries")
             
             # Fetch additional weeks if requested
             for week_num in range(2, n_weeks + 1):
                 logger.info(f"Attempting to fetch week {week_num} menu...")
                 
-                # Try both Swedish and English text for next week button
-                selectors = [
-                    "//*[contains(text(), 'Nästa vecka')]",  # Swedish
-                    "//*[contains(text(), 'Next week')]",   # English
-                    "//*[contains(text(), 'nästa vecka')]", # Swedish lowercase
-                    "//*[contains(text(), 'next week')]"    # English lowercase
-                ]
-                
-                next_week_button = None
-                button_text = None
-                
-                for selector in selectors:
-                    try:
-                        next_week_button = WebDriverWait(self.driver, 2).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        button_text = next_week_button.text
-                        logger.info(f"Found next week button with text: '{button_text}'")
-                        break
-                    except:
-                        continue
-                
-                if next_week_button:
-                    logger.info(f"Clicking next week button for week {week_num}: '{button_text}'")
-                    next_week_button.click()
-                    
-                    # Wait for page to update
-                    WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.ID, "menu-container"))
-                    )
-                    # Small delay to ensure content is fully loaded
-                    time.sleep(1)
-                    
-                    logger.info(f"Week {week_num} page loaded, parsing...")
-                    
-                    week_menu = self._parse_menu_data(school_name)
-                    menu_list += week_menu
-                    logger.info(f"Week {week_num} menu parsed: {len(week_menu)} entries")
-                    
-                else:
-                    logger.warning(f"Could not find next week button for week {week_num} in any language (Swedish/English)")
-                    # Log available buttons for debugging
-                    try:
-                        all_buttons = self.driver.find_elements(By.XPATH, "//button | //a | //*[@role='button']")
-                        button_texts = [btn.text.strip() for btn in all_buttons if btn.text.strip()]
-                        logger.info(f"Available clickable elements with text: {button_texts}")
-                    except:
-                        logger.warning("Could not retrieve available buttons for debugging")
-                    
-                    # Stop trying if we can't find the button
-                    logger.warning(f"Stopping at week {week_num-1} due to missing next week button")
+                if not next_url:
+                    # Stop trying if we can't find the link
+                    logger.warning(f"Stopping at week {week_num-1} due to missing next week link")
                     break
+                
+                logger.info(f"Following next week link for week {week_num}: {next_url}")
+                url = next_url
+                week_menu, next_url = await self._get_week(url, school_name, find_next_week=week_num < n_weeks)
+                menu_list += week_menu
+                logger.info(f"Week {week_num} menu parsed: {len(week_menu)} entries")
             
             logger.info(f"Total menu entries found: {len(menu_list)}")
             return menu_list
             
         except Exception as e:
-            logger.error(f"Navigation or page loading failed: {e}")
-            # Log page source for debugging if we can get it
-            try:
-                page_source_length = len(self.driver.page_source)
-                logger.info(f"Page source length: {page_source_length} characters")
-                if page_source_length < 1000:
-                    logger.warning(f"Page source seems too short: {self.driver.page_source[:500]}...")
-            except:
-                logger.error("Could not retrieve page source for debugging")
+            logger.error(f"Fetching or parsing {url} failed: {e}")
             raise
 
+    async def get_many(
+        self, school_names: List[str], n_weeks: int = 1, return_exceptions: bool = False
+    ) -> Dict[str, Union[List[dict], Exception]]:
+        """
+        Fetch menus for several schools concurrently over this client's session
+
+        Requests to the website are limited to MAX_CONNECTIONS_PER_HOST at
+        a time, each followed by POLITENESS_DELAY, see _request_slot. All
+        schools are finished before this returns, also when one of them
+        raises.
+
+        Args:
+            school_names: Names of the schools
+            n_weeks: Number of weeks to fetch (1 = current week, 2 = current + next, etc.)
+            return_exceptions: If set, a school whose fetch failed maps to the
+                exception, whatever it is, instead of an empty list
+
+        Returns:
+            Dict of school name to its list of menu entries, empty if fetching failed
+
+        Raises:
+            Exception: The first unexpected error (not a network, timeout or
+                MenuParseError) if return_exceptions is not set
+        """
+        async def _get_one(school_name: str) -> Union[List[dict], Exception]:
+            try:
+                return await self.get_menu(school_name, n_weeks=n_weeks)
+            except FETCH_ERRORS as e:
+                logger.error(f"Error fetching menu for {school_name}: {e}")
+                return e if return_exceptions else []
+
+        # Exceptions are collected rather than raised, so no fetch is left
+        # running against a session the caller is about to close
+        menus = await asyncio.gather(*(_get_one(name) for name in school_names), return_exceptions=True)
+
+        for school_name, menu in zip(school_names, menus):
+            if isinstance(menu, Exception) and not isinstance(menu, FETCH_ERRORS):
+                logger.error(f"Unexpected error fetching menu for {school_name}: {menu!r}")
+                if not return_exceptions:
+                    raise menu
+
+        return dict(zip(school_names, menus))
+
 
 def get_school_menu(
     school_name: str, n_weeks: int = 1
@@ -334,6 +616,10 @@ def get_school_menu(
     """
     Convenience function to get school menu
 
+    Each call opens its own HTTP session. To fetch several schools, use
+    get_school_menus, or SkolmatenAPI.get_many within a single SkolmatenAPI
+    context, so they share one connection pool.
+
     Args:
         school_name: Name of the school
         n_weeks: Number of weeks to fetch (1 = current week, 2 = current + next, etc.)
@@ -341,5 +627,28 @@ def get_school_menu(
     Returns:
         List of menu entries, each as a dict
     """
-    with SkolmatenAPI() as api:
-        return api.get_menu(school_name, n_weeks=n_weeks)
+    async def _get_menu():
+        async with SkolmatenAPI() as api:
+            return await api.get_menu(school_name, n_weeks=n_weeks)
+
+    return asyncio.run(_get_menu())
+
+
+def get_school_menus(
+    school_names: List[str], n_weeks: int = 1
+) -> Dict[str, List[dict]]:
+    """
+    Convenience function to get menus for several schools concurrently
+
+    Args:
+        school_names: Names of the schools
+        n_weeks: Number of weeks to fetch (1 = current week, 2 = current + next, etc.)
+
+    Returns:
+        Dict of school name to its list of menu entries, empty if fetching failed
+    """
+    async def _get_menus():
+        async with SkolmatenAPI() as api:
+            return await api.get_many(school_names, n_weeks=n_weeks)
+
+    return asyncio.run(_get_menus())